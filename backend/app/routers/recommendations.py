@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Path
+import asyncio
 import logging
 import tempfile
 import os
@@ -17,6 +18,9 @@ from app.services.vector_db_service import get_vector_db_service
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Number of recommendations returned per request
+RECOMMENDATION_COUNT = 3
+
 
 @router.post("/recommendations/{track_id}", response_model=RecommendationResponse)
 async def get_recommendations(
@@ -28,8 +32,8 @@ async def get_recommendations(
     Workflow:
     1. Download preview audio for the given track
     2. Generate embedding using OpenL3 model
-    3. Query vector database for top 10 similar tracks
-    4. Filter by popularity and return top 3
+    3. Query vector database for the most similar tracks
+    4. Drop the source track and return the top 3
 
     Args:
         track_id: Deezer track ID
@@ -86,9 +90,10 @@ async def get_recommendations(
 
         # Step 2: Query vector database for similar tracks
         logger.info("Querying vector database...")
-        results = vector_db.query_similar(embedding, n_results=10)
+        # One extra result covers the source track itself when it is stored
+        results = await vector_db.aquery_similar(embedding, n_results=RECOMMENDATION_COUNT + 1)
 
-        if not results['ids']:
+        if not results.ids:
             logger.warning("No similar tracks found in database")
             return RecommendationResponse(
                 tracks=[],
@@ -101,9 +106,9 @@ async def get_recommendations(
         recommendations = []
 
         for track_id_result, distance, metadata in zip(
-            results['ids'],
-            results['distances'],
-            results['metadatas']
+            results.ids,
+            results.distances,
+            results.metadatas
         ):
             # Skip if same track
             if track_id_result == track_id:
@@ -111,7 +116,7 @@ async def get_recommendations(
 
             # Convert distance to similarity score
             # ChromaDB cosine distance is in range [0, 2], convert to similarity [0, 1]
-            similarity_score = 1 - distance
+            similarity_score = 1 - float(distance)
 
             recommendations.append({
                 'id': track_id_result,
@@ -122,24 +127,26 @@ async def get_recommendations(
                 'cover': metadata.get('cover')
             })
 
-            # Stop after collecting 3 recommendations (already sorted by ChromaDB)
-            if len(recommendations) >= 3:
+            # Stop after collecting enough recommendations (already sorted by ChromaDB)
+            if len(recommendations) >= RECOMMENDATION_COUNT:
                 break
 
         top_3 = recommendations
 
-        # Refresh preview URLs from Deezer API
+        # Refresh preview URLs from Deezer API, all tracks at once
         logger.info("Refreshing preview URLs from Deezer...")
-        for rec in top_3:
-            try:
-                fresh_metadata = deezer_service.get_track_metadata(rec['id'])
-                if fresh_metadata:
-                    rec['preview_url'] = fresh_metadata.get('preview_url', '')
-                    # Update cover in case it changed
-                    if fresh_metadata.get('cover'):
-                        rec['cover'] = fresh_metadata['cover']
-            except Exception as e:
-                logger.warning(f"Could not refresh metadata for track {rec['id']}: {e}")
+        fresh_metadatas = await asyncio.to_thread(
+            deezer_service.get_tracks_metadata,
+            [rec['id'] for rec in top_3]
+        )
+
+        for rec, fresh_metadata in zip(top_3, fresh_metadatas):
+            if fresh_metadata:
+                rec['preview_url'] = fresh_metadata.get('preview_url', '')
+                # Update cover in case it changed
+                if fresh_metadata.get('cover'):
+                    rec['cover'] = fresh_metadata['cover']
+            else:
                 rec['preview_url'] = ''
 
         logger.info(f"Returning {len(top_3)} recommendations with fresh URLs")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+import asyncio
 import logging
 from typing import List
 
@@ -103,17 +104,19 @@ async def get_trending_tracks(limit: int = 8):
         # Take top N tracks
         top_tracks = tracks[:limit]
 
-        # Refresh preview URLs from Deezer API
-        for track in top_tracks:
-            try:
-                fresh_metadata = deezer_service.get_track_metadata(track['id'])
-                if fresh_metadata:
-                    track['preview_url'] = fresh_metadata.get('preview_url', '')
-                    # Update cover in case it changed
-                    if fresh_metadata.get('cover'):
-                        track['cover'] = fresh_metadata['cover']
-            except Exception as e:
-                logger.warning(f"Could not refresh metadata for track {track['id']}: {e}")
+        # Refresh preview URLs from Deezer API, all tracks at once
+        fresh_metadatas = await asyncio.to_thread(
+            deezer_service.get_tracks_metadata,
+            [track['id'] for track in top_tracks]
+        )
+
+        for track, fresh_metadata in zip(top_tracks, fresh_metadatas):
+            if fresh_metadata:
+                track['preview_url'] = fresh_metadata.get('preview_url', '')
+                # Update cover in case it changed
+                if fresh_metadata.get('cover'):
+                    track['cover'] = fresh_metadata['cover']
+            else:
                 track['preview_url'] = ''
 
         logger.info(f"Returning {len(top_tracks)} trending tracks with fresh URLs")
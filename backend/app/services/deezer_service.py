@@ -1,13 +1,121 @@
+import certifi
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_environ_proxies
+import urllib3
+from urllib3.util.retry import Retry
+import aiohttp
+import atexit
+import diskcache
+import io
+import orjson
 import logging
 import random
-from typing import Optional, Dict, List
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 import tempfile
+from urllib.parse import urlencode
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
 DEEZER_API_BASE = "https://api.deezer.com"
+USER_AGENT = 'MusicRecommendationApp/1.0'
+
+# Connection pooling for the sync session (API + preview CDN hosts)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+API_TIMEOUT = 10  # seconds, total per API call
+
+# Deezer error code for "quota exceeded" (its rate-limit signal, sent with HTTP 200)
+DEEZER_QUOTA_ERROR_CODE = 4
+
+# Threads shared by all concurrent Deezer requests (e.g. batch metadata lookups)
+EXECUTOR_WORKERS = 16
+
+# In-memory LRU cache of search results, keyed by normalized query tokens.
+# Results embed signed preview URLs, so entries never outlive those links.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 600  # seconds
+PREVIEW_EXPIRY_MARGIN = 60  # seconds kept between cache expiry and link expiry
+
+# On-disk copy of the search cache, so it survives restarts
+SEARCH_DISK_CACHE_PATH = Path(__file__).parent.parent / "db" / "deezer_cache"
+SEARCH_DISK_CACHE_EXPIRE = 86400  # seconds
+
+
+def _build_diacritics_table() -> Dict[int, str]:
+    """Translate table mapping accented Latin letters to their base letters."""
+    table = {}
+    for code in range(0x00C0, 0x0250):
+        base = ''.join(
+            c for c in unicodedata.normalize('NFKD', chr(code))
+            if not unicodedata.combining(c)
+        )
+        if base and base != chr(code):
+            table[code] = base
+    return table
+
+
+_executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="deezer")
+atexit.register(_executor.shutdown, wait=False)
+
+# Search cache key normalization: words only, accents folded
+_TOKEN_RE = re.compile(r"\w+")
+_DIACRITICS_TABLE = _build_diacritics_table()
+
+# Expiry timestamp of a signed Deezer preview URL (...?hdnea=exp=1700000000~acl=...)
+_PREVIEW_EXP_RE = re.compile(rb"\bexp=(\d+)")
+
+
+@lru_cache(maxsize=2048)
+def _search_qs(query: str, limit: int) -> str:
+    """Encoded query string for a search request, memoized for repeated queries."""
+    return urlencode({'q': query, 'limit': limit})
+
+
+class DeezerAPIError(Exception):
+    """Error reported by the Deezer API in a 200 response body ({"error": {...}})."""
+
+    def __init__(self, error: Dict):
+        self.code = error.get('code')
+        self.type = error.get('type')
+        super().__init__(f"Deezer API error {self.code} ({self.type}): {error.get('message')}")
+
+
+def _check_api_error(data: Dict) -> Dict:
+    """
+    Raise if a decoded Deezer response is an error payload.
+
+    Deezer reports errors (invalid query, quota exceeded...) with HTTP 200.
+
+    Args:
+        data: Decoded JSON response
+
+    Returns:
+        The same response, when it is not an error
+
+    Raises:
+        DeezerAPIError: If the response holds an "error" object
+    """
+    if isinstance(data, dict) and 'error' in data:
+        raise DeezerAPIError(data['error'])
+    return data
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """Whether a request was throttled (Deezer quota error, or HTTP 429)."""
+    if isinstance(exc, DeezerAPIError):
+        return exc.code == DEEZER_QUOTA_ERROR_CODE
+    return isinstance(exc, aiohttp.ClientResponseError) and exc.status == 429
 
 
 class DeezerService:
@@ -17,9 +125,125 @@ class DeezerService:
         self.base_url = DEEZER_API_BASE
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'MusicRecommendationApp/1.0'
+            'User-Agent': USER_AGENT,
+            'Connection': 'keep-alive'
         })
 
+        # Reuse connections across calls and retry transient gateway errors
+        retries = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retries
+        )
+        self.session.mount('https://', adapter)
+
+        # JSON API calls skip the requests layer and use urllib3 directly
+        self.http = self._create_pool_manager(retries)
+
+        self._search_cache: "OrderedDict[Tuple[str, int], Tuple[float, bytes, Optional[str]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+
+        try:
+            self._disk_cache: Optional[diskcache.Cache] = diskcache.Cache(str(SEARCH_DISK_CACHE_PATH))
+        except Exception as e:
+            logger.warning(f"Search disk cache unavailable, using memory only: {e}")
+            self._disk_cache = None
+
+    def _create_pool_manager(self, retries: Retry) -> urllib3.PoolManager:
+        """
+        Create the urllib3 pool used for JSON API calls.
+
+        Keeps what requests would otherwise provide: the certifi CA bundle,
+        proxies from the environment (HTTPS_PROXY, NO_PROXY...) and a timeout.
+
+        Args:
+            retries: Retry policy shared with the requests session
+
+        Returns:
+            PoolManager, or ProxyManager when a proxy is configured for the API
+        """
+        pool_kwargs = {
+            'num_pools': POOL_CONNECTIONS,
+            'maxsize': POOL_MAXSIZE,
+            'retries': retries,
+            'timeout': urllib3.Timeout(total=API_TIMEOUT),
+            'headers': {'User-Agent': USER_AGENT},
+            'cert_reqs': 'CERT_REQUIRED',
+            'ca_certs': certifi.where()
+        }
+
+        proxies = get_environ_proxies(self.base_url)
+        proxy_url = proxies.get('https') or proxies.get('all')
+        if not proxy_url:
+            return urllib3.PoolManager(**pool_kwargs)
+
+        proxy_auth = urllib3.util.parse_url(proxy_url).auth
+        proxy_headers = urllib3.util.make_headers(proxy_basic_auth=proxy_auth) if proxy_auth else None
+        return urllib3.ProxyManager(proxy_url, proxy_headers=proxy_headers, **pool_kwargs)
+
+    def preconnect(self, timeout: float = 2) -> None:
+        """
+        Open a pooled connection to the Deezer API ahead of the first real call.
+
+        Pays the DNS + TCP + TLS setup cost up front; failures are ignored.
+
+        Args:
+            timeout: Request timeout in seconds
+        """
+        try:
+            self.http.request('HEAD', f"{self.base_url}/", timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Deezer preconnect failed: {e}")
+
+    def _request(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> urllib3.HTTPResponse:
+        """
+        GET a Deezer API endpoint through the urllib3 pool.
+
+        Goes through urllib3 rather than the requests session to avoid its
+        per-request preparation overhead.
+
+        Args:
+            url: Endpoint URL
+            params: Optional query parameters
+            headers: Optional extra request headers
+
+        Returns:
+            urllib3 response (status below 400)
+        """
+        if headers:
+            headers = {**self.http.headers, **headers}
+
+        response = self.http.request('GET', url, fields=params, headers=headers)
+
+        if response.status >= 400:
+            raise requests.HTTPError(f"{response.status} Error for url: {url}")
+
+        return response
+
+    def _get_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET a Deezer API endpoint and decode the JSON body with orjson.
+
+        Args:
+            url: Endpoint URL
+            params: Optional query parameters
+
+        Returns:
+            Decoded JSON response
+        """
+        return _check_api_error(orjson.loads(self._request(url, params=params).data))
+
     def _parse_track(self, track_data: Dict) -> Dict:
         """
         Parse raw track data from Deezer API.
@@ -39,10 +263,146 @@ class DeezerService:
             'rank': track_data.get('rank', 0)
         }
 
+    @staticmethod
+    def _search_cache_key(query: str, limit: int) -> Tuple[str, int]:
+        """
+        Build the search cache key for a query.
+
+        Case, accents, punctuation and spacing are ignored, so that
+        "Hey Jude!", "hey  jude" and "Héy Jude" share the same entry. Word
+        order is kept: "you and me" and "me and you" are different songs.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            Tuple of (normalized query, limit)
+        """
+        normalized = query.lower().translate(_DIACRITICS_TABLE)
+        return ' '.join(_TOKEN_RE.findall(normalized)), limit
+
+    @staticmethod
+    def _disk_cache_key(key: Tuple[str, int]) -> str:
+        """String form of a search cache key for the disk cache."""
+        tokens, limit = key
+        return f"{tokens}|{limit}"
+
+    @staticmethod
+    def _search_cache_entry(
+        blob: bytes,
+        etag: Optional[str]
+    ) -> Tuple[float, bytes, Optional[str]]:
+        """
+        Build a search cache entry, expiring before its preview URLs do.
+
+        When the signed preview links expire before SEARCH_CACHE_TTL, the
+        entry expires with them and its ETag is dropped: a 304 would hand
+        back the same dead links, so it is fetched again instead.
+
+        Args:
+            blob: orjson-encoded list of parsed tracks
+            etag: ETag of the response the tracks came from, if any
+
+        Returns:
+            Tuple of (expiry timestamp, encoded tracks, ETag)
+        """
+        expires_at = time.time() + SEARCH_CACHE_TTL
+
+        link_expiries = _PREVIEW_EXP_RE.findall(blob)
+        if link_expiries:
+            links_expire_at = min(int(exp) for exp in link_expiries) - PREVIEW_EXPIRY_MARGIN
+            if links_expire_at < expires_at:
+                return links_expire_at, blob, None
+
+        return expires_at, blob, etag
+
+    def _search_cache_get(
+        self,
+        key: Tuple[str, int]
+    ) -> Optional[Tuple[bytes, Optional[str], bool]]:
+        """
+        Look up search results in the cache.
+
+        Memory misses fall back to the disk cache. Expired entries that
+        carry an ETag are kept so they can be revalidated with
+        If-None-Match; others are dropped.
+
+        Args:
+            key: Key from _search_cache_key
+
+        Returns:
+            Tuple of (encoded tracks, ETag, still fresh), or None on a miss
+        """
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+
+        if entry is None and self._disk_cache is not None:
+            try:
+                entry = self._disk_cache.get(self._disk_cache_key(key))
+            except Exception as e:
+                logger.warning(f"Error reading search disk cache: {e}")
+
+        with self._search_cache_lock:
+            if entry is None:
+                return None
+
+            # Keep a newer in-memory entry if one was stored meanwhile
+            entry = self._search_cache.setdefault(key, entry)
+
+            expires_at, blob, etag = entry
+            fresh = time.time() < expires_at
+            if not fresh and etag is None:
+                del self._search_cache[key]
+                return None
+
+            self._search_cache.move_to_end(key)
+
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
+        return blob, etag, fresh
+
+    def _search_cache_put(
+        self,
+        key: Tuple[str, int],
+        blob: bytes,
+        etag: Optional[str] = None
+    ) -> None:
+        """
+        Store search results in the cache, evicting the least recently used entry.
+
+        Tracks are kept as compact orjson bytes rather than live dicts, and
+        also written to the disk cache.
+
+        Args:
+            key: Key from _search_cache_key
+            blob: orjson-encoded list of parsed tracks
+            etag: ETag of the response the tracks came from, if any
+        """
+        entry = self._search_cache_entry(blob, etag)
+
+        with self._search_cache_lock:
+            self._search_cache[key] = entry
+            self._search_cache.move_to_end(key)
+
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(self._disk_cache_key(key), entry, expire=SEARCH_DISK_CACHE_EXPIRE)
+            except Exception as e:
+                logger.warning(f"Error writing search disk cache: {e}")
+
     def search_tracks(self, query: str, limit: int = 1, return_all: bool = False):
         """
         Search for tracks by name.
 
+        Results are cached for SEARCH_CACHE_TTL seconds (less if their
+        preview URLs expire sooner), then revalidated with If-None-Match
+        when Deezer sent an ETag.
+
         Args:
             query: Search query (track name)
             limit: Maximum number of results
@@ -52,29 +412,100 @@ class DeezerService:
             Single track dict (return_all=False) or list of tracks (return_all=True) or None
         """
         try:
-            url = f"{self.base_url}/search"
-            params = {
-                'q': query,
-                'limit': limit
-            }
+            cache_key = self._search_cache_key(query, limit)
+            cached = self._search_cache_get(cache_key)
+
+            if cached and cached[2]:
+                blob = cached[0]
+            else:
+                url = f"{self.base_url}/search?{_search_qs(query, limit)}"
+                headers = {'If-None-Match': cached[1]} if cached else None
+                response = self._request(url, headers=headers)
+
+                if response.status == 304 and cached:
+                    # Not modified: keep the cached tracks for another TTL
+                    blob = cached[0]
+                    self._search_cache_put(cache_key, blob, cached[1])
+                else:
+                    # Error payloads raise here, so they are never cached
+                    data = _check_api_error(orjson.loads(response.data))
+                    blob = orjson.dumps(self._parse_search_results(data, return_all=True))
+                    self._search_cache_put(cache_key, blob, response.headers.get('ETag'))
+
+            # Decoding yields fresh dicts, which callers may modify (e.g. the search router)
+            tracks = orjson.loads(blob)
+
+            if return_all:
+                return tracks
+            return tracks[0] if tracks else None
 
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Error searching tracks: {e}")
+            raise
+
+    @retry(
+        retry=retry_if_exception(_is_rate_limited),
+        wait=wait_exponential(min=1, max=8),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def async_search_tracks(
+        self,
+        session: aiohttp.ClientSession,
+        query: str,
+        limit: int = 1,
+        return_all: bool = False
+    ):
+        """
+        Search for tracks by name without blocking the event loop.
 
-            data = response.json()
-            tracks_data = data.get('data', [])
+        Same as search_tracks, but issued through an aiohttp session so that
+        several searches can run concurrently. Throttled responses (Deezer
+        quota error code 4, or HTTP 429) are retried with exponential
+        back-off; other error payloads raise DeezerAPIError.
+
+        Args:
+            session: aiohttp session used for the request
+            query: Search query (track name)
+            limit: Maximum number of results
+            return_all: If True, return all results; if False, return first result only
 
-            if not tracks_data:
-                return [] if return_all else None
+        Returns:
+            Single track dict (return_all=False) or list of tracks (return_all=True) or None
+        """
+        try:
+            url = f"{self.base_url}/search?{_search_qs(query, limit)}"
 
-            tracks = [self._parse_track(track) for track in tracks_data]
+            async with session.get(url, headers={'User-Agent': USER_AGENT}) as response:
+                response.raise_for_status()
+                data = _check_api_error(orjson.loads(await response.read()))
 
-            return tracks if return_all else tracks[0]
+            return self._parse_search_results(data, return_all)
 
         except Exception as e:
             logger.error(f"Error searching tracks: {e}")
             raise
 
+    def _parse_search_results(self, data: Dict, return_all: bool):
+        """
+        Parse a Deezer search response.
+
+        Args:
+            data: Decoded JSON response from the search endpoint
+            return_all: If True, return all results; if False, return first result only
+
+        Returns:
+            Single track dict (return_all=False) or list of tracks (return_all=True) or None
+        """
+        tracks_data = data.get('data', [])
+
+        if not tracks_data:
+            return [] if return_all else None
+
+        tracks = [self._parse_track(track) for track in tracks_data]
+
+        return tracks if return_all else tracks[0]
+
     def get_track_metadata(self, track_id: str) -> Optional[Dict]:
         """
         Get detailed metadata for a track.
@@ -87,10 +518,7 @@ class DeezerService:
         """
         try:
             url = f"{self.base_url}/track/{track_id}"
-            response = self.session.get(url)
-            response.raise_for_status()
-
-            track = response.json()
+            track = self._get_json(url)
 
             return {
                 'id': str(track['id']),
@@ -106,6 +534,34 @@ class DeezerService:
             logger.error(f"Error fetching track metadata: {e}")
             raise
 
+    def get_tracks_metadata(self, track_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Get metadata for several tracks with parallel requests.
+
+        Duplicate IDs are fetched once. Failed lookups are logged and
+        returned as None instead of raising.
+
+        Args:
+            track_ids: Deezer track IDs
+
+        Returns:
+            Track metadata (or None) for each ID, in input order
+        """
+        unique_ids = list(dict.fromkeys(track_ids))
+        if not unique_ids:
+            return []
+
+        def fetch(track_id: str) -> Optional[Dict]:
+            try:
+                return self.get_track_metadata(track_id)
+            except Exception as e:
+                logger.warning(f"Could not fetch metadata for track {track_id}: {e}")
+                return None
+
+        fetched = dict(zip(unique_ids, _executor.map(fetch, unique_ids)))
+
+        return [fetched[track_id] for track_id in track_ids]
+
     def download_preview(self, preview_url: str, output_path: Optional[str] = None) -> str:
         """
         Download audio preview from Deezer.
@@ -128,13 +584,11 @@ class DeezerService:
                 output_path = temp_file.name
                 temp_file.close()
 
-            # Download preview
-            response = self.session.get(preview_url, stream=True)
-            response.raise_for_status()
-
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Stream preview straight to disk in 64 KB chunks
+            with self.session.get(preview_url, stream=True) as response, open(output_path, 'wb') as f:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, f, length=64 * 1024)
 
             logger.info(f"Downloaded preview to {output_path}")
             return output_path
@@ -143,6 +597,30 @@ class DeezerService:
             logger.error(f"Error downloading preview: {e}")
             raise
 
+    def download_preview_to_memory(self, preview_url: str) -> io.BytesIO:
+        """
+        Download audio preview from Deezer into an in-memory buffer.
+
+        Avoids the temporary file round-trip when the audio is consumed
+        right away (e.g. to generate an embedding).
+
+        Args:
+            preview_url: URL to preview MP3
+
+        Returns:
+            Buffer positioned at the start of the audio data
+        """
+        try:
+            response = self.session.get(preview_url)
+            response.raise_for_status()
+
+            logger.debug(f"Downloaded preview into memory ({len(response.content)} bytes)")
+            return io.BytesIO(response.content)
+
+        except Exception as e:
+            logger.error(f"Error downloading preview: {e}")
+            raise
+
     def get_chart_tracks(self, limit: int = 100, index: int = 0) -> List[Dict]:
         """
         Get top chart tracks from Deezer.
@@ -161,10 +639,7 @@ class DeezerService:
                 'index': index
             }
 
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._get_json(url, params=params)
             tracks = []
 
             for track in data.get('data', []):
@@ -257,10 +732,7 @@ class DeezerService:
                     'index': random_offset
                 }
 
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-
-                data = response.json()
+                data = self._get_json(url, params=params)
                 tracks_data = data.get('data', [])
 
                 # Shuffle the results
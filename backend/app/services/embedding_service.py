@@ -2,12 +2,17 @@
 Audio embedding service using OpenL3.
 """
 
+import io
 import logging
-from typing import Optional
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
 
 import numpy as np
 import librosa
 import openl3
+import soundfile as sf
 
 logger = logging.getLogger(__name__)
 
@@ -38,19 +43,60 @@ class EmbeddingService:
 
         logger.info("OpenL3 model loaded successfully (music, 512-dim)")
 
-    def generate_embedding(self, audio_path: str, target_sr: int = 48000) -> np.ndarray:
+    def _load_audio(self, audio_path: Union[str, Path, BinaryIO], target_sr: int):
+        """
+        Load mono audio with librosa.
+
+        librosa only falls back to audioread/ffmpeg for paths: with a
+        file-like object, a soundfile failure (e.g. libsndfile < 1.1 without
+        MP3 support) is raised as is. In that case the buffer is written to
+        a temporary file and decoded from there, like the API path does.
+
+        Args:
+            audio_path: path to an audio file or a file-like object
+            target_sr: sample rate to resample to
+
+        Returns:
+            Tuple of (audio samples, sample rate)
+        """
+        if isinstance(audio_path, (str, Path)):
+            return librosa.load(audio_path, sr=target_sr, mono=True)
+
+        try:
+            return librosa.load(audio_path, sr=target_sr, mono=True)
+        except sf.SoundFileRuntimeError as e:
+            logger.debug(f"soundfile could not decode audio buffer, using a temp file: {e}")
+
+        audio_path.seek(0)
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', prefix='embedding_audio_')
+        try:
+            with temp_file:
+                temp_file.write(audio_path.read())
+            return librosa.load(temp_file.name, sr=target_sr, mono=True)
+        finally:
+            os.remove(temp_file.name)
+
+    def generate_embedding(
+        self,
+        audio_path: Union[str, Path, bytes, BinaryIO],
+        target_sr: int = 48000
+    ) -> np.ndarray:
         """
         Generates an OpenL3 embedding for a given audio file.
 
         Args:
-            audio_path: path to an audio file (ideally ~30s clip)
+            audio_path: path to an audio file (ideally ~30s clip), raw audio
+                bytes, or a file-like object such as io.BytesIO
             target_sr: sample rate for the model (default: 48000)
 
         Returns:
             np.ndarray: normalized embedding vector (1D)
         """
+        if isinstance(audio_path, (bytes, bytearray)):
+            audio_path = io.BytesIO(audio_path)
+
         # Load audio with librosa
-        audio, sr = librosa.load(audio_path, sr=target_sr, mono=True)
+        audio, sr = self._load_audio(audio_path, target_sr)
 
         # Center crop for speed (take 15s from middle instead of full 30s)
         audio_duration = len(audio) / sr
@@ -1,30 +1,86 @@
 import chromadb
 from chromadb.config import Settings
 import numpy as np
+import asyncio
+import atexit
 import logging
-from typing import List, Dict, Optional
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, NamedTuple, Set
 from pathlib import Path
 import json
+from pybloom_live import ScalableBloomFilter
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent / "db" / "vector_store"
 
+# HNSW index parameters
+HNSW_M = 16
+HNSW_CONSTRUCTION_EF = 200
+HNSW_BULK_CONSTRUCTION_EF = 400  # Higher graph quality when building offline
+HNSW_SEARCH_EF = 128
+BULK_LOAD_BATCH_SIZE = 512
+STAGING_SUFFIX = "_staging"  # Collection the offline bulk load builds before swapping in
+
+# Worker threads for async queries
+READ_POOL_WORKERS = 8
+
+# Bloom filter over stored track IDs, used to skip lookups for unknown tracks.
+# It is pickled together with the number of IDs added to it; the file is only
+# reused when that number matches the collection count. Every process (API,
+# scripts) saves its own in-memory filter to the same file, so a process that
+# missed another writer's additions will save a count that no longer matches,
+# and the next startup rebuilds the filter rather than trusting it. A running
+# process does not see tracks added by other processes in its filter, so a
+# miss is only trusted while the collection count still matches the filter.
+# Unsaved additions are written by flush_bloom(), called at exit (and
+# explicitly by worker processes, which skip atexit handlers).
+BLOOM_FILENAME = "bloom.pkl"
+BLOOM_INITIAL_CAPACITY = 10_000
+BLOOM_ERROR_RATE = 0.001
+BLOOM_SAVE_EVERY = 100  # Persist after this many unsaved additions
+
+# Fields fetched for single-track lookups
+TRACK_INCLUDE = ["embeddings", "metadatas"]
+TRACK_METADATA_INCLUDE = ["metadatas"]
+
+# Fields fetched for similarity queries (Chroma also returns documents by default)
+QUERY_INCLUDE = ["metadatas", "distances"]
+
+
+class QueryResult(NamedTuple):
+    """Results of a similarity query, ordered from most to least similar."""
+    ids: List[str]
+    distances: np.ndarray
+    metadatas: List[Dict]
+
 
 class VectorDBService:
     """Service for managing the vector database with ChromaDB."""
 
-    def __init__(self, db_path: Optional[Path] = None, collection_name: str = "music_embeddings"):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        collection_name: str = "music_embeddings",
+        m: int = HNSW_M,
+        ef_construction: int = HNSW_CONSTRUCTION_EF
+    ):
         """
         Initialize the vector database service.
 
         Args:
             db_path: Path to store the database
             collection_name: Name of the collection
+            m: HNSW max neighbors per node (only applied when the collection is created)
+            ef_construction: HNSW build-time candidate list size (only applied when the collection is created)
         """
         self.db_path = db_path or DB_PATH
         self.db_path.mkdir(parents=True, exist_ok=True)
         self.collection_name = collection_name
+        self.m = m
+        self.ef_construction = ef_construction
 
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
@@ -38,11 +94,123 @@ class VectorDBService:
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            metadata=self._collection_metadata()
+        )
+
+        # Membership pre-check for track_exists
+        self._bloom_path = self.db_path / BLOOM_FILENAME
+        self._bloom_unsaved = 0
+        self._bloom_count = 0  # IDs added to the filter (len() undercounts false positives)
+        self._bloom = self._load_bloom()
+        atexit.register(self.flush_bloom)
+
+        # Thread pool running queries off the event loop for async callers
+        self._read_pool = ThreadPoolExecutor(
+            max_workers=READ_POOL_WORKERS,
+            thread_name_prefix="chromaread"
         )
 
         logger.info(f"Initialized VectorDB at {self.db_path}, collection: {collection_name}")
 
+    def _collection_metadata(self, ef_construction: Optional[int] = None) -> Dict:
+        """
+        Build the collection metadata holding the HNSW index configuration.
+
+        Args:
+            ef_construction: Override for the build-time candidate list size
+
+        Returns:
+            Collection metadata dictionary
+        """
+        return {
+            "hnsw:space": "cosine",  # Use cosine similarity
+            "hnsw:M": self.m,
+            "hnsw:construction_ef": ef_construction or self.ef_construction,
+            "hnsw:search_ef": HNSW_SEARCH_EF
+        }
+
+    def _load_bloom(self) -> ScalableBloomFilter:
+        """
+        Load the track ID bloom filter from disk, rebuilding it if stale.
+
+        The filter is considered stale when the number of IDs saved with it
+        does not match the collection (missing file, unsaved additions,
+        deleted tracks, tracks added by another process...).
+
+        Returns:
+            Bloom filter containing every stored track ID
+        """
+        try:
+            with open(self._bloom_path, 'rb') as f:
+                saved = pickle.load(f)
+
+            if saved['count'] == self.collection.count():
+                self._bloom_count = saved['count']
+                return saved['bloom']
+
+            logger.info("Track ID bloom filter is out of date, rebuilding")
+
+        except FileNotFoundError:
+            logger.info("No track ID bloom filter found, building it")
+        except Exception as e:
+            logger.warning(f"Could not load track ID bloom filter, rebuilding: {e}")
+
+        bloom = ScalableBloomFilter(
+            initial_capacity=BLOOM_INITIAL_CAPACITY,
+            error_rate=BLOOM_ERROR_RATE
+        )
+        track_ids = self.collection.get(include=[])['ids']
+        for track_id in track_ids:
+            bloom.add(track_id)
+
+        self._bloom = bloom
+        self._bloom_count = len(track_ids)
+        self._save_bloom()
+        return bloom
+
+    def _save_bloom(self) -> None:
+        """Persist the track ID bloom filter next to the database."""
+        try:
+            tmp_path = self._bloom_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(
+                    {'bloom': self._bloom, 'count': self._bloom_count},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, self._bloom_path)
+            self._bloom_unsaved = 0
+
+        except Exception as e:
+            logger.warning(f"Could not save track ID bloom filter: {e}")
+
+    def _bloom_add(self, track_ids: List[str]) -> None:
+        """Record stored track IDs in the bloom filter, persisting periodically."""
+        for track_id in track_ids:
+            self._bloom.add(track_id)
+
+        self._bloom_count += len(track_ids)
+        self._bloom_unsaved += len(track_ids)
+        if self._bloom_unsaved >= BLOOM_SAVE_EVERY:
+            self._save_bloom()
+
+    def flush_bloom(self) -> None:
+        """Persist the bloom filter if it has additions not yet saved."""
+        if self._bloom_unsaved:
+            self._save_bloom()
+
+    def _bloom_is_current(self) -> bool:
+        """
+        Whether the bloom filter holds every stored track ID.
+
+        False when another process added tracks (or tracks were deleted)
+        since the filter was built, in which case a miss proves nothing.
+        """
+        try:
+            return self.collection.count() == self._bloom_count
+        except Exception:
+            return False
+
     def add_track(
         self,
         track_id: str,
@@ -68,12 +236,21 @@ class VectorDBService:
                 metadatas=[metadata]
             )
 
+            self._bloom_add([track_id])
+
             logger.info(f"Added track {track_id} to database")
 
         except Exception as e:
             logger.error(f"Error adding track {track_id}: {e}")
             raise
 
+    @staticmethod
+    def _stack_embeddings(embeddings: List[np.ndarray]) -> np.ndarray:
+        """Stack and re-normalize embeddings into a single float32 matrix."""
+        emb_arr = np.stack([np.asarray(emb, dtype=np.float32) for emb in embeddings])
+        emb_arr /= np.linalg.norm(emb_arr, axis=1, keepdims=True)
+        return emb_arr
+
     def bulk_add_tracks(
         self,
         track_ids: List[str],
@@ -89,19 +266,17 @@ class VectorDBService:
             metadatas: List of metadata dictionaries
         """
         try:
-            # Convert embeddings to lists
-            embedding_lists = [
-                emb.tolist() if isinstance(emb, np.ndarray) else emb
-                for emb in embeddings
-            ]
+            emb_arr = self._stack_embeddings(embeddings)
 
             # Add to collection
             self.collection.add(
                 ids=track_ids,
-                embeddings=embedding_lists,
+                embeddings=emb_arr.tolist(),
                 metadatas=metadatas
             )
 
+            self._bloom_add(track_ids)
+
             logger.info(f"Added {len(track_ids)} tracks to database")
 
         except Exception as e:
@@ -112,8 +287,9 @@ class VectorDBService:
         self,
         embedding: np.ndarray,
         n_results: int = 10,
-        filter_dict: Optional[Dict] = None
-    ) -> Dict:
+        filter_dict: Optional[Dict] = None,
+        include: List[str] = QUERY_INCLUDE
+    ) -> QueryResult:
         """
         Query for similar tracks based on embedding.
 
@@ -121,9 +297,10 @@ class VectorDBService:
             embedding: Query embedding vector
             n_results: Number of results to return
             filter_dict: Optional metadata filter
+            include: Fields to fetch besides ids
 
         Returns:
-            Dictionary with ids, distances, and metadatas
+            QueryResult with ids, distances, and metadatas
         """
         try:
             # Convert embedding to list
@@ -133,19 +310,55 @@ class VectorDBService:
             results = self.collection.query(
                 query_embeddings=[embedding_list],
                 n_results=n_results,
-                where=filter_dict
+                where=filter_dict,
+                include=include
             )
 
-            return {
-                'ids': results['ids'][0] if results['ids'] else [],
-                'distances': results['distances'][0] if results['distances'] else [],
-                'metadatas': results['metadatas'][0] if results['metadatas'] else []
-            }
+            return QueryResult(
+                ids=results['ids'][0] if results['ids'] else [],
+                distances=np.asarray(
+                    results['distances'][0] if results.get('distances') else [],
+                    dtype=np.float32
+                ),
+                metadatas=results['metadatas'][0] if results.get('metadatas') else []
+            )
 
         except Exception as e:
             logger.error(f"Error querying similar tracks: {e}")
             raise
 
+    async def aquery_similar(
+        self,
+        embedding: np.ndarray,
+        n_results: int = 10,
+        filter_dict: Optional[Dict] = None,
+        include: List[str] = QUERY_INCLUDE
+    ) -> QueryResult:
+        """
+        Query for similar tracks without blocking the event loop.
+
+        Runs query_similar in the read thread pool, so several queries can
+        be awaited concurrently with asyncio.gather.
+
+        Args:
+            embedding: Query embedding vector
+            n_results: Number of results to return
+            filter_dict: Optional metadata filter
+            include: Fields to fetch besides ids
+
+        Returns:
+            QueryResult with ids, distances, and metadatas
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._read_pool,
+            self.query_similar,
+            embedding,
+            n_results,
+            filter_dict,
+            include
+        )
+
     def get_track(self, track_id: str) -> Optional[Dict]:
         """
         Get a track by ID.
@@ -159,13 +372,18 @@ class VectorDBService:
         try:
             result = self.collection.get(
                 ids=[track_id],
-                include=["embeddings", "metadatas"]
+                include=TRACK_INCLUDE
             )
 
             if result['ids']:
+                # Newer ChromaDB versions already return ndarrays: avoid copying them
+                embedding = result['embeddings'][0]
+                if not isinstance(embedding, np.ndarray):
+                    embedding = np.asarray(embedding, dtype=np.float32)
+
                 return {
                     'id': result['ids'][0],
-                    'embedding': np.array(result['embeddings'][0]),
+                    'embedding': embedding,
                     'metadata': result['metadatas'][0]
                 }
 
@@ -175,6 +393,31 @@ class VectorDBService:
             logger.error(f"Error getting track {track_id}: {e}")
             raise
 
+    def get_track_metadata_only(self, track_id: str) -> Optional[Dict]:
+        """
+        Get a track's metadata by ID without loading its embedding.
+
+        Args:
+            track_id: Track identifier
+
+        Returns:
+            Track metadata or None if not found
+        """
+        try:
+            result = self.collection.get(
+                ids=[track_id],
+                include=TRACK_METADATA_INCLUDE
+            )
+
+            if result['ids']:
+                return result['metadatas'][0]
+
+            return None
+
+        except Exception as e:
+            logger.error(f"Error getting metadata for track {track_id}: {e}")
+            raise
+
     def track_exists(self, track_id: str) -> bool:
         """
         Check if a track exists in the database.
@@ -185,6 +428,11 @@ class VectorDBService:
         Returns:
             True if track exists, False otherwise
         """
+        # The bloom filter has no false negatives: a miss is a definite no,
+        # as long as no other process added tracks behind its back
+        if track_id not in self._bloom and self._bloom_is_current():
+            return False
+
         try:
             result = self.collection.get(ids=[track_id])
             return len(result['ids']) > 0
@@ -193,6 +441,31 @@ class VectorDBService:
             logger.error(f"Error checking track existence: {e}")
             return False
 
+    def tracks_exist(self, track_ids: List[str]) -> Set[str]:
+        """
+        Check which of the given tracks exist in the database, in one lookup.
+
+        Args:
+            track_ids: Track identifiers (duplicates allowed)
+
+        Returns:
+            Set of the track IDs that exist
+        """
+        # Only IDs the bloom filter may contain need a database lookup
+        candidates = list(dict.fromkeys(track_ids))
+        if self._bloom_is_current():
+            candidates = [tid for tid in candidates if tid in self._bloom]
+        if not candidates:
+            return set()
+
+        try:
+            result = self.collection.get(ids=candidates, include=[])
+            return set(result['ids'])
+
+        except Exception as e:
+            logger.error(f"Error checking tracks existence: {e}")
+            return set()
+
     def delete_track(self, track_id: str) -> None:
         """
         Delete a track from the database.
@@ -222,20 +495,116 @@ class VectorDBService:
             logger.error(f"Error counting tracks: {e}")
             return 0
 
-    def reset_database(self) -> None:
-        """Reset the entire database (use with caution)."""
+    def reset_database(self, ef_construction: Optional[int] = None) -> None:
+        """
+        Reset the entire database (use with caution).
+
+        Args:
+            ef_construction: Optional override for the HNSW build-time candidate list size
+        """
         try:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}
+                metadata=self._collection_metadata(ef_construction)
+            )
+
+            self._bloom = ScalableBloomFilter(
+                initial_capacity=BLOOM_INITIAL_CAPACITY,
+                error_rate=BLOOM_ERROR_RATE
             )
+            self._bloom_count = 0
+            self._save_bloom()
+
             logger.warning("Database has been reset")
 
         except Exception as e:
             logger.error(f"Error resetting database: {e}")
             raise
 
+    def bulk_load_offline(
+        self,
+        track_ids: List[str],
+        embeddings: List[np.ndarray],
+        metadatas: List[Dict]
+    ) -> None:
+        """
+        Rebuild the database from scratch with all tracks loaded at once.
+
+        The tracks are inserted in large batches into a staging collection
+        built with a higher construction_ef (the index is built offline).
+        The live collection is only replaced once every batch succeeded, so
+        a failure leaves it untouched. Duplicate IDs keep their first entry.
+
+        Args:
+            track_ids: List of track identifiers
+            embeddings: List of embedding vectors
+            metadatas: List of metadata dictionaries
+
+        Raises:
+            ValueError: If the input lists differ in length or the embeddings
+                do not share one dimension
+        """
+        if not len(track_ids) == len(embeddings) == len(metadatas):
+            raise ValueError(
+                f"Length mismatch: {len(track_ids)} ids, {len(embeddings)} embeddings, "
+                f"{len(metadatas)} metadatas"
+            )
+
+        # Chroma rejects a batch whose IDs repeat
+        first_index = {}
+        for idx, track_id in enumerate(track_ids):
+            first_index.setdefault(track_id, idx)
+
+        keep = list(first_index.values())
+        if len(keep) < len(track_ids):
+            logger.warning(f"Dropping {len(track_ids) - len(keep)} duplicate track IDs")
+
+        ids = [track_ids[idx] for idx in keep]
+        metas = [metadatas[idx] for idx in keep]
+        emb_arr = self._stack_embeddings([embeddings[idx] for idx in keep]) if keep else None
+
+        staging_name = f"{self.collection_name}{STAGING_SUFFIX}"
+
+        try:
+            # Leftover from an interrupted run
+            self.client.delete_collection(name=staging_name)
+        except Exception:
+            pass
+
+        staging = self.client.create_collection(
+            name=staging_name,
+            metadata=self._collection_metadata(HNSW_BULK_CONSTRUCTION_EF)
+        )
+
+        try:
+            for start in range(0, len(ids), BULK_LOAD_BATCH_SIZE):
+                end = start + BULK_LOAD_BATCH_SIZE
+                staging.add(
+                    ids=ids[start:end],
+                    embeddings=emb_arr[start:end].tolist(),
+                    metadatas=metas[start:end]
+                )
+        except Exception as e:
+            logger.error(f"Bulk load failed, keeping the current collection: {e}")
+            self.client.delete_collection(name=staging_name)
+            raise
+
+        # Swap the staging collection in
+        self.client.delete_collection(name=self.collection_name)
+        staging.modify(name=self.collection_name)
+        self.collection = staging
+
+        self._bloom = ScalableBloomFilter(
+            initial_capacity=BLOOM_INITIAL_CAPACITY,
+            error_rate=BLOOM_ERROR_RATE
+        )
+        self._bloom_count = 0
+        self._bloom_add(ids)
+        self._save_bloom()
+
+        logger.info(f"Bulk loaded {len(ids)} tracks into fresh collection")
+
 
 # Global instance
 _vector_db_service: Optional[VectorDBService] = None
@@ -14,10 +14,10 @@ Usage:
 """
 
 import sys
-import os
 import argparse
 import logging
 import time
+from collections import Counter
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -80,79 +80,76 @@ def add_songs_by_query(query: str, count: int = 10, skip_existing: bool = True):
         # Step 2: Process each track
         logger.info(f"\nStep 2/3: Processing {len(tracks)} tracks...")
 
-        success_count = 0
-        skip_count = 0
-        error_count = 0
+        stats = Counter()
+        total = len(tracks)
+        prefix_tpl = f"[%d/{total}]"
 
         start_time = time.time()
 
         for idx, track in enumerate(tracks, 1):
             track_id = track['id']
+            prefix = prefix_tpl % idx
 
             try:
                 # Check if already exists
                 if skip_existing and vector_db.track_exists(track_id):
-                    logger.info(f"[{idx}/{len(tracks)}] Track {track_id} already exists, skipping")
-                    skip_count += 1
+                    logger.info(f"{prefix} Track {track_id} already exists, skipping")
+                    stats['skipped'] += 1
                     continue
 
                 # Check if preview available
                 if not track.get('preview_url'):
-                    logger.warning(f"[{idx}/{len(tracks)}] Track {track_id} has no preview, skipping")
-                    skip_count += 1
+                    logger.warning(f"{prefix} Track {track_id} has no preview, skipping")
+                    stats['skipped'] += 1
                     continue
 
                 # Download preview
-                logger.info(f"[{idx}/{len(tracks)}] Processing: {track['title']} by {track['artist']}")
-                audio_file = deezer_service.download_preview(track['preview_url'])
-
-                try:
-                    # Generate embedding
-                    embedding = embedding_service.generate_embedding(audio_file)
-
-                    # Store in database
-                    vector_db.add_track(
-                        track_id=track_id,
-                        embedding=embedding,
-                        metadata={
-                            'title': track['title'],
-                            'artist': track['artist'],
-                            'rank': track.get('rank', 0),
-                            'preview_url': track['preview_url'],
-                            'cover': track.get('cover'),
-                            'position': track.get('position', idx)
-                        }
-                    )
-
-                    success_count += 1
-                    logger.info(f"[{idx}/{len(tracks)}] ✓ Added successfully")
-
-                finally:
-                    # Cleanup audio file
-                    if os.path.exists(audio_file):
-                        os.remove(audio_file)
+                logger.info(f"{prefix} Processing: {track['title']} by {track['artist']}")
+                audio = deezer_service.download_preview_to_memory(track['preview_url'])
+
+                # Generate embedding
+                embedding = embedding_service.generate_embedding(audio)
+
+                # Store in database
+                vector_db.add_track(
+                    track_id=track_id,
+                    embedding=embedding,
+                    metadata={
+                        'title': track['title'],
+                        'artist': track['artist'],
+                        'rank': track.get('rank', 0),
+                        'preview_url': track['preview_url'],
+                        'cover': track.get('cover'),
+                        'position': track.get('position', idx)
+                    }
+                )
+
+                stats['success'] += 1
+                logger.info(f"{prefix} ✓ Added successfully")
 
                 # Rate limiting: small delay between requests
                 time.sleep(0.1)
 
             except Exception as e:
-                logger.error(f"[{idx}/{len(tracks)}] ✗ Error processing track {track_id}: {e}")
-                error_count += 1
+                logger.error(f"{prefix} ✗ Error processing track {track_id}: {e}")
+                stats['errors'] += 1
                 continue
 
+        vector_db.flush_bloom()
+
         # Step 3: Summary
         total_time = time.time() - start_time
         logger.info("\n" + "=" * 60)
         logger.info("Operation Complete!")
         logger.info("=" * 60)
         logger.info(f"Query: '{query}'")
-        logger.info(f"✓ Successfully added: {success_count} tracks")
-        logger.info(f"⊘ Skipped: {skip_count} tracks")
-        logger.info(f"✗ Errors: {error_count} tracks")
+        logger.info(f"✓ Successfully added: {stats['success']} tracks")
+        logger.info(f"⊘ Skipped: {stats['skipped']} tracks")
+        logger.info(f"✗ Errors: {stats['errors']} tracks")
         logger.info(f"Total time: {total_time:.1f} seconds")
 
-        if success_count > 0:
-            logger.info(f"Average time per track: {total_time/success_count:.1f}s")
+        if stats['success'] > 0:
+            logger.info(f"Average time per track: {total_time/stats['success']:.1f}s")
 
         logger.info(f"\nFinal database size: {vector_db.count_tracks()} tracks")
         logger.info("=" * 60)
@@ -9,22 +9,26 @@ This script:
 4. Stores embeddings in ChromaDB
 
 Usage:
-    python scripts/init_vector_db.py [--count N] [--reset] [--resume]
+    python scripts/init_vector_db.py [--count N] [--reset] [--resume] [--workers K]
 """
 
 import sys
-import os
 import argparse
 import logging
+import multiprocessing
 import time
+from collections import Counter
 from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.deezer_service import get_deezer_service
 from app.services.embedding_service import get_embedding_service
-from app.services.vector_db_service import get_vector_db_service
+from app.services.vector_db_service import get_vector_db_service, VectorDBService
 
 # Configure logging
 logging.basicConfig(
@@ -33,8 +37,322 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Parallel ingest settings
+QUEUE_MAXSIZE = 256
+WRITER_BATCH_SIZE = 256
+PROCESS_POLL_INTERVAL = 1.0  # seconds between liveness checks
+
+
+def _track_metadata(track: Dict, idx: int) -> Dict:
+    """Build the metadata stored alongside a track's embedding."""
+    return {
+        'title': track['title'],
+        'artist': track['artist'],
+        'rank': track.get('rank', 0),
+        'preview_url': track['preview_url'],
+        'cover': track.get('cover'),
+        'position': track.get('position', idx)
+    }
+
+
+def ingest_sequential(tracks: List[Dict], vector_db: VectorDBService, reset: bool, resume: bool) -> Counter:
+    """
+    Download, embed and store tracks one at a time in this process.
+
+    Args:
+        tracks: Tracks to index
+        vector_db: Vector database service
+        reset: If True, rebuild the collection from the processed tracks at the end
+        resume: If True, skip already indexed tracks
+
+    Returns:
+        Counter with success, skipped and errors counts
+    """
+    deezer_service = get_deezer_service()
+    embedding_service = get_embedding_service()
+
+    pending_ids = []
+    pending_embeddings = []
+    pending_metadatas = []
+
+    stats = Counter()
+    total = len(tracks)
+    prefix_tpl = f"[%d/{total}]"
+
+    start_time = time.time()
+
+    for idx, track in enumerate(tracks, 1):
+        track_id = track['id']
+        prefix = prefix_tpl % idx
+
+        try:
+            # Check if already exists (for resume functionality)
+            # The old collection is still present until the end of a reset run
+            if resume and not reset and vector_db.track_exists(track_id):
+                logger.info(f"{prefix} Track {track_id} already exists, skipping")
+                stats['skipped'] += 1
+                continue
+
+            # Check if preview available
+            if not track.get('preview_url'):
+                logger.warning(f"{prefix} Track {track_id} has no preview, skipping")
+                stats['skipped'] += 1
+                continue
+
+            # Download preview
+            audio = deezer_service.download_preview_to_memory(track['preview_url'])
+
+            # Generate embedding
+            embedding = embedding_service.generate_embedding(audio)
+
+            metadata = _track_metadata(track, idx)
+
+            # Store in database (or buffer for the offline bulk load)
+            if reset:
+                pending_ids.append(track_id)
+                pending_embeddings.append(embedding)
+                pending_metadatas.append(metadata)
+            else:
+                vector_db.add_track(
+                    track_id=track_id,
+                    embedding=embedding,
+                    metadata=metadata
+                )
+
+            stats['success'] += 1
+
+            # Progress logging
+            if stats['success'] % 10 == 0:
+                elapsed = time.time() - start_time
+                avg_time = elapsed / stats['success']
+                remaining = (total - idx) * avg_time
+
+                logger.info(
+                    f"{prefix} Progress: {stats['success']} indexed, "
+                    f"{stats['skipped']} skipped, {stats['errors']} errors | "
+                    f"ETA: {remaining/60:.1f} min"
+                )
+
+            # Rate limiting: small delay between requests
+            time.sleep(0.1)
+
+        except Exception as e:
+            logger.error(f"{prefix} Error processing track {track_id}: {e}")
+            stats['errors'] += 1
+            continue
+
+    if reset:
+        logger.info(f"\nBuilding index from {len(pending_ids)} tracks...")
+        vector_db.bulk_load_offline(pending_ids, pending_embeddings, pending_metadatas)
+        logger.info("✓ Database reset and rebuilt")
+    else:
+        vector_db.flush_bloom()
+
+    return stats
+
+
+def _produce_embeddings(indexed_tracks: List[Tuple[int, Dict]], queue, errors) -> None:
+    """
+    Worker process: download previews and generate embeddings.
+
+    Each result is sent to the writer as (track_id, float32 bytes, metadata);
+    a final None tells the writer this worker is done, even if the services
+    fail to load.
+    """
+    try:
+        deezer_service = get_deezer_service()
+        embedding_service = get_embedding_service()
+
+        for idx, track in indexed_tracks:
+            try:
+                audio = deezer_service.download_preview_to_memory(track['preview_url'])
+                embedding = embedding_service.generate_embedding(audio)
+
+                queue.put((
+                    track['id'],
+                    np.asarray(embedding, dtype=np.float32).tobytes(),
+                    _track_metadata(track, idx)
+                ))
+
+                # Rate limiting: small delay between requests
+                time.sleep(0.1)
+
+            except Exception as e:
+                logger.error(f"Error processing track {track['id']}: {e}")
+                with errors.get_lock():
+                    errors.value += 1
+
+    finally:
+        queue.put(None)
+
+
+def _write_embeddings(queue, num_producers: int, reset: bool, stored, errors) -> None:
+    """
+    Writer process: the only owner of the ChromaDB handle.
+
+    Drains the queue and inserts embeddings in batches, or buffers everything
+    for a single offline bulk load when resetting.
+    """
+    vector_db = get_vector_db_service()
+
+    batch_ids = []
+    batch_embeddings = []
+    batch_metadatas = []
+
+    def flush():
+        try:
+            if reset:
+                vector_db.bulk_load_offline(batch_ids, batch_embeddings, batch_metadatas)
+            else:
+                vector_db.bulk_add_tracks(batch_ids, batch_embeddings, batch_metadatas)
+            stored.value += len(batch_ids)
+        except Exception as e:
+            logger.error(f"Error storing {len(batch_ids)} tracks: {e}")
+            with errors.get_lock():
+                errors.value += len(batch_ids)
+
+        batch_ids.clear()
+        batch_embeddings.clear()
+        batch_metadatas.clear()
+
+    finished = 0
+    while finished < num_producers:
+        item = queue.get()
+
+        if item is None:
+            finished += 1
+            continue
+
+        track_id, embedding_bytes, metadata = item
+        batch_ids.append(track_id)
+        batch_embeddings.append(np.frombuffer(embedding_bytes, dtype=np.float32))
+        batch_metadatas.append(metadata)
+
+        if not reset and len(batch_ids) >= WRITER_BATCH_SIZE:
+            flush()
+
+    if batch_ids or reset:
+        flush()
+
+    # Child processes skip atexit handlers, so save the filter explicitly
+    vector_db.flush_bloom()
+
+
+def _join_processes(processes: List[multiprocessing.Process]) -> None:
+    """
+    Wait for the ingest processes, stopping all of them if one fails.
+
+    A dead writer leaves producers blocked on the full queue, and a dead
+    producer may never send its sentinel, so a plain join() could hang.
+
+    Args:
+        processes: Started writer and producer processes
+
+    Raises:
+        RuntimeError: If any process exited with a non-zero code
+    """
+    def failed_processes():
+        return [p for p in processes if p.exitcode not in (None, 0)]
+
+    while any(p.is_alive() for p in processes) and not failed_processes():
+        time.sleep(PROCESS_POLL_INTERVAL)
+
+    failed = failed_processes()
+    if failed:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+        details = ", ".join(f"{p.name} (exit code {p.exitcode})" for p in failed)
+        logger.error(f"Ingest process failed: {details}; stopped the remaining processes")
+        raise RuntimeError(f"Ingest process failed: {details}")
+
+    for process in processes:
+        process.join()
+
+
+def ingest_parallel(
+    tracks: List[Dict],
+    vector_db: VectorDBService,
+    reset: bool,
+    resume: bool,
+    workers: int
+) -> Counter:
+    """
+    Download and embed tracks in worker processes, with a single writer process.
+
+    Each worker loads its own embedding model and handles every K-th track;
+    the writer owns the ChromaDB handle and stores results in batches.
+
+    Args:
+        tracks: Tracks to index
+        vector_db: Vector database service (used for resume checks only)
+        reset: If True, rebuild the collection from the processed tracks at the end
+        resume: If True, skip already indexed tracks
+        workers: Number of embedding worker processes
+
+    Returns:
+        Counter with success, skipped and errors counts
+    """
+    stats = Counter()
+
+    # Filter out skipped tracks before dispatching work
+    indexed_tracks = []
+    for idx, track in enumerate(tracks, 1):
+        if resume and not reset and vector_db.track_exists(track['id']):
+            stats['skipped'] += 1
+        elif not track.get('preview_url'):
+            stats['skipped'] += 1
+        else:
+            indexed_tracks.append((idx, track))
+
+    logger.info(f"Dispatching {len(indexed_tracks)} tracks to {workers} workers ({stats['skipped']} skipped)")
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue(maxsize=QUEUE_MAXSIZE)
+    stored = ctx.Value('i', 0)
+    errors = ctx.Value('i', 0)
 
-def init_database(count: int = 1000, reset: bool = False, resume: bool = False, use_random: bool = True):
+    writer = ctx.Process(
+        target=_write_embeddings,
+        args=(queue, workers, reset, stored, errors),
+        name="db-writer",
+        daemon=True
+    )
+    producers = [
+        ctx.Process(
+            target=_produce_embeddings,
+            args=(indexed_tracks[k::workers], queue, errors),
+            name=f"embed-worker-{k}",
+            daemon=True
+        )
+        for k in range(workers)
+    ]
+    processes = [writer, *producers]
+
+    for process in processes:
+        process.start()
+
+    _join_processes(processes)
+
+    # The writer recreated the collection on reset; this handle points at the old one
+    if reset:
+        vector_db.collection = vector_db.client.get_collection(name=vector_db.collection_name)
+
+    stats['success'] = stored.value
+    stats['errors'] = errors.value
+    return stats
+
+
+def init_database(
+    count: int = 1000,
+    reset: bool = False,
+    resume: bool = False,
+    use_random: bool = True,
+    workers: int = 1
+):
     """
     Initialize the vector database with tracks.
 
@@ -43,6 +361,7 @@ def init_database(count: int = 1000, reset: bool = False, resume: bool = False,
         reset: If True, reset database before initializing
         resume: If True, skip already indexed tracks
         use_random: If True, fetch random tracks; if False, fetch top chart tracks
+        workers: Number of embedding worker processes (1 = process in this process)
     """
     logger.info("=" * 60)
     logger.info("Vector Database Initialization")
@@ -52,14 +371,15 @@ def init_database(count: int = 1000, reset: bool = False, resume: bool = False,
         # Initialize services
         logger.info("Initializing services...")
         deezer_service = get_deezer_service()
-        embedding_service = get_embedding_service()
         vector_db = get_vector_db_service()
 
-        # Reset if requested
+        # On reset, embeddings are buffered and loaded in one pass at the end
         if reset:
-            logger.warning("Resetting database...")
-            vector_db.reset_database()
-            logger.info("✓ Database reset complete")
+            logger.warning("Database will be reset and rebuilt once all tracks are processed")
+            logger.warning(
+                "Reset runs are all-or-nothing: if interrupted, the current database "
+                "is kept but all processed tracks are lost (--resume does not apply)"
+            )
 
         # Check existing tracks
         existing_count = vector_db.count_tracks()
@@ -89,99 +409,40 @@ def init_database(count: int = 1000, reset: bool = False, resume: bool = False,
         logger.info(f"\nStep 2/3: Processing {len(tracks)} tracks...")
         logger.info("This may take 30-60 minutes depending on your connection\n")
 
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-
         start_time = time.time()
 
-        for idx, track in enumerate(tracks, 1):
-            track_id = track['id']
-
-            try:
-                # Check if already exists (for resume functionality)
-                if resume and vector_db.track_exists(track_id):
-                    logger.info(f"[{idx}/{len(tracks)}] Track {track_id} already exists, skipping")
-                    skip_count += 1
-                    continue
-
-                # Check if preview available
-                if not track.get('preview_url'):
-                    logger.warning(f"[{idx}/{len(tracks)}] Track {track_id} has no preview, skipping")
-                    skip_count += 1
-                    continue
-
-                # Download preview
-                audio_file = deezer_service.download_preview(track['preview_url'])
-
-                try:
-                    # Generate embedding
-                    embedding = embedding_service.generate_embedding(audio_file)
-
-                    # Store in database
-                    vector_db.add_track(
-                        track_id=track_id,
-                        embedding=embedding,
-                        metadata={
-                            'title': track['title'],
-                            'artist': track['artist'],
-                            'rank': track.get('rank', 0),
-                            'preview_url': track['preview_url'],
-                            'cover': track.get('cover'),
-                            'position': track.get('position', idx)
-                        }
-                    )
-
-                    success_count += 1
-
-                    # Progress logging
-                    if success_count % 10 == 0:
-                        elapsed = time.time() - start_time
-                        avg_time = elapsed / success_count
-                        remaining = (len(tracks) - idx) * avg_time
-
-                        logger.info(
-                            f"[{idx}/{len(tracks)}] Progress: {success_count} indexed, "
-                            f"{skip_count} skipped, {error_count} errors | "
-                            f"ETA: {remaining/60:.1f} min"
-                        )
-
-                finally:
-                    # Cleanup audio file
-                    if os.path.exists(audio_file):
-                        os.remove(audio_file)
-
-                # Rate limiting: small delay between requests
-                time.sleep(0.1)
-
-            except Exception as e:
-                logger.error(f"[{idx}/{len(tracks)}] Error processing track {track_id}: {e}")
-                error_count += 1
-                continue
+        if workers > 1:
+            stats = ingest_parallel(tracks, vector_db, reset=reset, resume=resume, workers=workers)
+        else:
+            stats = ingest_sequential(tracks, vector_db, reset=reset, resume=resume)
 
         # Step 3: Summary
         total_time = time.time() - start_time
         logger.info("\n" + "=" * 60)
         logger.info("Initialization Complete!")
         logger.info("=" * 60)
-        logger.info(f"✓ Successfully indexed: {success_count} tracks")
-        logger.info(f"⊘ Skipped: {skip_count} tracks")
-        logger.info(f"✗ Errors: {error_count} tracks")
+        logger.info(f"✓ Successfully indexed: {stats['success']} tracks")
+        logger.info(f"⊘ Skipped: {stats['skipped']} tracks")
+        logger.info(f"✗ Errors: {stats['errors']} tracks")
         logger.info(f"Total time: {total_time/60:.1f} minutes")
-        logger.info(f"Average time per track: {total_time/success_count:.1f}s")
+        logger.info(f"Average time per track: {total_time/stats['success']:.1f}s")
         logger.info(f"\nFinal database size: {vector_db.count_tracks()} tracks")
         logger.info("=" * 60)
 
-        if success_count < count * 0.8:
+        if stats['success'] < count * 0.8:
             logger.warning(
-                f"\n⚠️  Warning: Only {success_count}/{count} tracks indexed successfully. "
+                f"\n⚠️  Warning: Only {stats['success']}/{count} tracks indexed successfully. "
                 "This may affect recommendation quality."
             )
 
     except KeyboardInterrupt:
         logger.warning("\n\nInitialization interrupted by user")
         logger.info(f"Current database size: {vector_db.count_tracks()} tracks")
-        logger.info("Run with --resume to continue from where you left off")
+        if reset:
+            logger.info("Reset runs only write at the end: processed tracks were discarded")
+            logger.info("Run with --reset again to rebuild the database")
+        else:
+            logger.info("Run with --resume to continue from where you left off")
         sys.exit(1)
 
     except Exception as e:
@@ -217,6 +478,12 @@ def main():
         default='random',
         help='Track selection mode: "random" for random tracks, "top" for chart top tracks (default: random)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of embedding worker processes, each loading its own model (default: 1)'
+    )
 
     args = parser.parse_args()
 
@@ -228,6 +495,10 @@ def main():
     if args.count > 2000:
         logger.warning(f"Large count ({args.count}) may take several hours")
 
+    if args.workers < 1:
+        logger.error("Workers must be at least 1")
+        sys.exit(1)
+
     # Convert mode to boolean
     use_random = (args.mode == 'random')
 
@@ -236,7 +507,8 @@ def main():
         count=args.count,
         reset=args.reset,
         resume=args.resume,
-        use_random=use_random
+        use_random=use_random,
+        workers=args.workers
     )
 
 
@@ -13,11 +13,15 @@ Usage:
 """
 
 import sys
+import os
 import logging
+import threading
 from pathlib import Path
 import argparse
 import json
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -30,6 +34,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# One line of the top-tracks listing
+TRACK_LINE_TPL = "  %2d. %-30s by %-20s [Preview: %s]"
+
 
 def test_search(query: str):
     """Test search functionality."""
@@ -112,20 +119,21 @@ def test_download_preview(track_id: str):
         file_path = deezer.download_preview(metadata['preview_url'])
 
         # Check file
-        if Path(file_path).exists():
-            file_size = Path(file_path).stat().st_size
-            print(f"\n✓ Download successful!")
-            print(f"  File: {file_path}")
-            print(f"  Size: {file_size / 1024:.1f} KB")
-
-            # Cleanup
-            Path(file_path).unlink()
-            print(f"  Cleaned up temporary file")
-            return True
-        else:
+        try:
+            file_size = os.stat(file_path).st_size
+        except FileNotFoundError:
             print("\n✗ Download failed")
             return False
 
+        print(f"\n✓ Download successful!")
+        print(f"  File: {file_path}")
+        print(f"  Size: {file_size / 1024:.1f} KB")
+
+        # Cleanup
+        os.unlink(file_path)
+        print(f"  Cleaned up temporary file")
+        return True
+
     except Exception as e:
         print(f"\n✗ Error: {e}")
         return False
@@ -145,12 +153,19 @@ def test_top_tracks(count: int = 10):
             print(f"\n✓ Fetched {len(tracks)} tracks successfully!")
             print("\nTop tracks:")
 
-            for i, track in enumerate(tracks[:10], 1):  # Show first 10
-                has_preview = "✓" if track.get('preview_url') else "✗"
-                print(f"  {i:2d}. {track['title']:<30} by {track['artist']:<20} [Preview: {has_preview}]")
+            print("\n".join([  # Show first 10
+                TRACK_LINE_TPL % (i, track['title'], track['artist'],
+                                  '✓' if track.get('preview_url') else '✗')
+                for i, track in enumerate(tracks[:10], 1)
+            ]))
 
             # Statistics
-            with_preview = sum(1 for t in tracks if t.get('preview_url'))
+            has_preview = np.fromiter(
+                (bool(t.get('preview_url')) for t in tracks),
+                dtype=bool,
+                count=len(tracks)
+            )
+            with_preview = int(has_preview.sum())
             print(f"\nStatistics:")
             print(f"  Total tracks: {len(tracks)}")
             print(f"  With preview: {with_preview} ({with_preview/len(tracks)*100:.1f}%)")
@@ -251,6 +266,11 @@ def main():
 
     args = parser.parse_args()
 
+    # Warm up the Deezer connection in the background
+    warmup = threading.Thread(target=get_deezer_service().preconnect, daemon=True)
+    warmup.start()
+    warmup.join(timeout=0.2)
+
     # Interactive mode if no command
     if args.command is None:
         interactive_mode()
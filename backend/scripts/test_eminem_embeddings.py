@@ -3,6 +3,7 @@ Test script for embedding service using Eminem song previews.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add backend to path
@@ -46,14 +47,16 @@ def main():
     print("Generating embeddings...")
     print("-" * 60)
 
-    print("\n1. Processing 'Lose Yourself'...")
-    emb1 = service.generate_embedding(str(lose_yourself))
+    # Decode and embed both tracks concurrently
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        emb1, emb2 = pool.map(service.generate_embedding, [str(lose_yourself), str(till_i_collapse)])
+
+    print("\n1. Processed 'Lose Yourself'")
     print(f"   ✓ Embedding shape: {emb1.shape}")
     print(f"   ✓ Embedding norm: {np.linalg.norm(emb1):.4f}")
     print(f"   ✓ First 5 values: {emb1[:5]}")
 
-    print("\n2. Processing 'Till I Collapse'...")
-    emb2 = service.generate_embedding(str(till_i_collapse))
+    print("\n2. Processed 'Till I Collapse'")
     print(f"   ✓ Embedding shape: {emb2.shape}")
     print(f"   ✓ Embedding norm: {np.linalg.norm(emb2):.4f}")
     print(f"   ✓ First 5 values: {emb2[:5]}")
@@ -63,7 +66,12 @@ def main():
     print("Calculating similarity...")
     print("-" * 60)
 
-    similarity = service.calculate_similarity(emb1, emb2)
+    # Full similarity matrix in one product: S[i, j] = cos(emb_i, emb_j)
+    M = np.stack([emb1, emb2])
+    M /= np.linalg.norm(M, axis=1, keepdims=True)
+    S = M @ M.T
+
+    similarity = S[0, 1]
     print(f"\nCosine similarity between the two tracks: {similarity:.4f}")
     print(f"(Range: -1 to 1, where 1 = identical, 0 = orthogonal, -1 = opposite)")
 
@@ -72,8 +80,8 @@ def main():
     print("Self-similarity check (should be ~1.0)...")
     print("-" * 60)
 
-    self_sim1 = service.calculate_similarity(emb1, emb1)
-    self_sim2 = service.calculate_similarity(emb2, emb2)
+    self_sim1 = S[0, 0]
+    self_sim2 = S[1, 1]
     print(f"\n'Lose Yourself' vs itself: {self_sim1:.6f}")
     print(f"'Till I Collapse' vs itself: {self_sim2:.6f}")
 
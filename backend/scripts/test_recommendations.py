@@ -5,6 +5,7 @@ Test recommendation quality by checking similarity scores.
 
 import sys
 from pathlib import Path
+import numpy as np
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.vector_db_service import get_vector_db_service
@@ -15,31 +16,41 @@ def test_recommendations():
     # Get a few sample tracks
     result = db.collection.get(limit=5, include=['embeddings', 'metadatas'])
 
+    if not result['ids']:
+        print("Database is empty, nothing to test.")
+        return
+
+    # Query similar tracks for all samples in a single call
+    similar_batch = db.collection.query(
+        query_embeddings=result['embeddings'],
+        n_results=6,
+        include=['metadatas', 'distances']
+    )
+
     print("Testing recommendation quality...\n")
     print("=" * 80)
 
-    for i, (track_id, embedding, metadata) in enumerate(zip(
-        result['ids'], result['embeddings'], result['metadatas']
-    )):
-        print(f"\nTest {i+1}: {metadata.get('title')} by {metadata.get('artist')}")
-        print("-" * 80)
-
-        # Query similar tracks
-        similar = db.query_similar(embedding, n_results=6)
+    for i, (track_id, metadata) in enumerate(zip(result['ids'], result['metadatas'])):
+        lines = [
+            f"\nTest {i+1}: {metadata.get('title')} by {metadata.get('artist')}",
+            "-" * 80,
+            f"{'Rank':<6} {'Title':<30} {'Artist':<20} {'Distance':<10} {'Similarity'}",
+            "-" * 80
+        ]
 
-        print(f"{'Rank':<6} {'Title':<30} {'Artist':<20} {'Distance':<10} {'Similarity'}")
-        print("-" * 80)
+        distances = similar_batch['distances'][i]
+        sims = np.clip(1.0 - np.asarray(distances), 0.0, 1.0)
 
         for rank, (sim_id, distance, sim_meta) in enumerate(zip(
-            similar['ids'], similar['distances'], similar['metadatas']
+            similar_batch['ids'][i], distances, similar_batch['metadatas'][i]
         ), 1):
-            similarity = max(0.0, min(1.0, 1 - distance))
+            similarity = sims[rank - 1]
             is_same = "★ SAME" if sim_id == track_id else ""
-            print(f"{rank:<6} {sim_meta.get('title', 'Unknown')[:30]:<30} "
-                  f"{sim_meta.get('artist', 'Unknown')[:20]:<20} "
-                  f"{distance:<10.4f} {similarity:.4f} {is_same}")
+            lines.append(f"{rank:<6} {sim_meta.get('title', 'Unknown')[:30]:<30} "
+                         f"{sim_meta.get('artist', 'Unknown')[:20]:<20} "
+                         f"{distance:<10.4f} {similarity:.4f} {is_same}")
 
-        print()
+        print('\n'.join(lines) + '\n')
 
 if __name__ == "__main__":
     test_recommendations()
@@ -17,10 +17,18 @@ Usage:
 """
 
 import sys
+import asyncio
+import shelve
+import threading
 from pathlib import Path
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 import requests
+from requests.adapters import HTTPAdapter
 import time
-from typing import List, Dict, Optional
+from statistics import median
+from typing import List, Dict, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -28,6 +36,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.services.vector_db_service import get_vector_db_service
 from app.services.deezer_service import get_deezer_service
 
+# On-disk cache of Deezer artist searches, so re-runs skip the network
+DEEZER_CACHE_PATH = Path(__file__).parent / '.deezer_cache'
+DEEZER_CACHE_TTL = 3600  # seconds
+
+# Keep-alive connections to the backend, reused across API calls
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
 
 # ANSI color codes for terminal output
 class Colors:
@@ -46,14 +62,27 @@ def print_header(text: str):
     print(f"{Colors.BOLD}{'=' * 80}{Colors.END}")
 
 
+def format_subheader(text: str) -> List[str]:
+    """Format a subsection header as output lines."""
+    return [
+        f"\n{Colors.BOLD}{'-' * 80}{Colors.END}",
+        f"{Colors.BOLD}{text}{Colors.END}",
+        f"{Colors.BOLD}{'-' * 80}{Colors.END}"
+    ]
+
+
 def print_subheader(text: str):
     """Print a subsection header."""
-    print(f"\n{Colors.BOLD}{'-' * 80}{Colors.END}")
-    print(f"{Colors.BOLD}{text}{Colors.END}")
-    print(f"{Colors.BOLD}{'-' * 80}{Colors.END}")
+    print('\n'.join(format_subheader(text)))
 
 
-def check_backend_health(api_url: str = "http://localhost:8000") -> Optional[Dict]:
+def _warmup(vector_db):
+    """Touch the vector database so its first real lookup is fast."""
+    vector_db.count_tracks()
+
+
+def check_backend_health(session: requests.Session,
+                         api_url: str = "http://localhost:8000") -> Optional[Dict]:
     """
     Check if backend is running and healthy.
 
@@ -63,13 +92,13 @@ def check_backend_health(api_url: str = "http://localhost:8000") -> Optional[Dic
     print(f"\n{Colors.BLUE}Checking backend health...{Colors.END}")
 
     try:
-        response = requests.get(f"{api_url}/health", timeout=5)
+        response = session.get(f"{api_url}/health", timeout=5)
 
         if response.status_code != 200:
             print(f"{Colors.RED}❌ Backend returned error: {response.status_code}{Colors.END}")
             return None
 
-        health_data = response.json()
+        health_data = orjson.loads(response.content)
 
         if health_data.get('status') != 'healthy':
             print(f"{Colors.RED}❌ Backend is unhealthy{Colors.END}")
@@ -92,8 +121,60 @@ def check_backend_health(api_url: str = "http://localhost:8000") -> Optional[Dic
         return None
 
 
-def find_unknown_tracks(artists: List[str] = ["Eminem", "Drake", "The Weeknd"],
-                       tracks_per_artist: int = 20) -> List[Dict]:
+async def search_artists(artists: List[str], tracks_per_artist: int) -> List:
+    """
+    Search Deezer for all artists concurrently.
+
+    Results younger than DEEZER_CACHE_TTL are served from the on-disk cache.
+
+    Returns:
+        One entry per artist: its list of tracks, or the exception raised
+    """
+    deezer_service = get_deezer_service()
+
+    # At most 5 searches in flight and ~10 requests/second (Deezer API policy)
+    semaphore = asyncio.Semaphore(5)
+    limiter = AsyncLimiter(10, 1)
+
+    async def search(session: aiohttp.ClientSession, artist: str):
+        async with semaphore, limiter:
+            return await deezer_service.async_search_tracks(
+                session,
+                artist,
+                limit=tracks_per_artist,
+                return_all=True
+            )
+
+    with shelve.open(str(DEEZER_CACHE_PATH)) as cache:
+        now = time.time()
+        results = {}
+
+        for artist in artists:
+            entry = cache.get(f"{artist}:{tracks_per_artist}")
+            if entry and now - entry[0] < DEEZER_CACHE_TTL:
+                results[artist] = entry[1]
+
+        misses = [artist for artist in artists if artist not in results]
+
+        if misses:
+            connector = aiohttp.TCPConnector(limit_per_host=5)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                fetched = await asyncio.gather(
+                    *[search(session, artist) for artist in misses],
+                    return_exceptions=True
+                )
+
+            for artist, tracks in zip(misses, fetched):
+                results[artist] = tracks
+                # Failed searches, including Deezer error payloads, are not cached
+                if not isinstance(tracks, Exception):
+                    cache[f"{artist}:{tracks_per_artist}"] = (now, tracks)
+
+    return [results[artist] for artist in artists]
+
+
+async def find_unknown_tracks(artists: List[str] = ["Eminem", "Drake", "The Weeknd"],
+                             tracks_per_artist: int = 20) -> List[Dict]:
     """
     Find tracks that are NOT in the database.
 
@@ -106,32 +187,27 @@ def find_unknown_tracks(artists: List[str] = ["Eminem", "Drake", "The Weeknd"],
     """
     print(f"\n{Colors.BLUE}Finding tracks NOT in database...{Colors.END}")
 
-    deezer_service = get_deezer_service()
     vector_db = get_vector_db_service()
 
-    unknown_tracks = []
-
-    for artist in artists:
-        try:
-            # Search for tracks by this artist
-            tracks = deezer_service.search_tracks(
-                artist,
-                limit=tracks_per_artist,
-                return_all=True
-            )
+    # Search for tracks by all artists at once
+    search_results = await search_artists(artists, tracks_per_artist)
 
-            # Filter to tracks NOT in database
-            for track in tracks:
-                track_id = track['id']
-                if not vector_db.track_exists(track_id):
-                    # Add artist name to track for easy reference
-                    track['search_artist'] = artist
-                    unknown_tracks.append(track)
+    all_tracks = []
 
-        except Exception as e:
-            print(f"{Colors.YELLOW}⚠️  Error searching for {artist}: {e}{Colors.END}")
+    for artist, tracks in zip(artists, search_results):
+        if isinstance(tracks, Exception):
+            print(f"{Colors.YELLOW}⚠️  Error searching for {artist}: {tracks}{Colors.END}")
             continue
 
+        for track in tracks:
+            # Add artist name to track for easy reference
+            track['search_artist'] = artist
+            all_tracks.append(track)
+
+    # Filter to tracks NOT in database, with a single lookup
+    existing = await asyncio.to_thread(vector_db.tracks_exist, [t['id'] for t in all_tracks])
+    unknown_tracks = [t for t in all_tracks if t['id'] not in existing]
+
     if not unknown_tracks:
         print(f"{Colors.YELLOW}⚠️  No unknown tracks found{Colors.END}")
         print(f"   All searched tracks are already in the database")
@@ -141,49 +217,71 @@ def find_unknown_tracks(artists: List[str] = ["Eminem", "Drake", "The Weeknd"],
     return unknown_tracks
 
 
-def test_track_via_api(track_id: str,
-                       track_title: str,
-                       track_artist: str,
-                       test_num: int,
-                       total_tests: int,
-                       api_url: str = "http://localhost:8000") -> Optional[Dict]:
+async def test_track_via_api(session: aiohttp.ClientSession,
+                             track_id: str,
+                             track_title: str,
+                             track_artist: str,
+                             test_num: int,
+                             total_tests: int,
+                             api_url: str = "http://localhost:8000") -> Optional[Dict]:
     """
     Test recommendations for a single track via API.
 
+    Output is buffered and written in one go once the test completes, so
+    that concurrent tests don't interleave their sections.
+
     Returns:
         Test results dict or None if test failed
     """
-    print_subheader(f"Test {test_num}/{total_tests}: {track_title} by {track_artist}")
-    print(f"Track ID: {track_id}")
+    request_error = None
 
     try:
         # Make API call
         start_time = time.time()
-        response = requests.post(
+        async with session.post(
             f"{api_url}/api/recommendations/{track_id}",
-            timeout=120  # 2 minutes for slow embeddings
-        )
+            timeout=aiohttp.ClientTimeout(total=120)  # 2 minutes for slow embeddings
+        ) as response:
+            status = response.status
+            body = await response.read()
         elapsed_time = time.time() - start_time
 
-        if response.status_code != 200:
-            print(f"{Colors.RED}❌ API Error: {response.status_code}{Colors.END}")
-            print(f"   Response: {response.text[:200]}")
+    except asyncio.TimeoutError:
+        request_error = (f"{Colors.RED}❌ Request timeout (>120s){Colors.END}\n"
+                         f"   The embedding generation might be too slow")
+    except aiohttp.ClientConnectionError:
+        request_error = f"{Colors.RED}❌ Connection error - backend might have crashed{Colors.END}"
+    except Exception as e:
+        request_error = f"{Colors.RED}❌ Error: {e}{Colors.END}"
+
+    lines = format_subheader(f"Test {test_num}/{total_tests}: {track_title} by {track_artist}")
+    lines.append(f"Track ID: {track_id}")
+
+    if request_error:
+        lines.append(request_error)
+        print('\n'.join(lines))
+        return None
+
+    try:
+        if status != 200:
+            lines.append(f"{Colors.RED}❌ API Error: {status}{Colors.END}")
+            lines.append(f"   Response: {body[:200].decode(errors='replace')}")
             return None
 
-        data = response.json()
+        data = orjson.loads(body)
 
-        print(f"{Colors.GREEN}✓ API call successful (took {elapsed_time:.1f}s){Colors.END}")
+        lines.append(f"{Colors.GREEN}✓ API call successful (took {elapsed_time:.1f}s){Colors.END}")
 
         if not data.get('tracks'):
-            print(f"{Colors.RED}❌ No recommendations returned{Colors.END}")
+            lines.append(f"{Colors.RED}❌ No recommendations returned{Colors.END}")
             return None
 
         recommendations = data['tracks']
-        print(f"{Colors.GREEN}✓ Got {len(recommendations)} recommendations{Colors.END}")
+        lines.append(f"{Colors.GREEN}✓ Got {len(recommendations)} recommendations{Colors.END}")
 
         # Display recommendations table
-        print(f"\n  {'Rank':<6} {'Title':<30} {'Artist':<20} {'Similarity'}")
-        print(f"  {'-' * 80}")
+        lines.append(f"\n  {'Rank':<6} {'Title':<30} {'Artist':<20} {'Similarity'}")
+        lines.append(f"  {'-' * 80}")
 
         for i, rec in enumerate(recommendations, 1):
             title = rec['title'][:28]
@@ -198,7 +296,7 @@ def test_track_via_api(track_id: str,
             else:
                 sim_color = Colors.RED
 
-            print(f"  {i:<6} {title:<30} {artist:<20} {sim_color}{similarity:.3f}{Colors.END}")
+            lines.append(f"  {i:<6} {title:<30} {artist:<20} {sim_color}{similarity:.3f}{Colors.END}")
 
         # Calculate statistics
         similarities = [r['similarity_score'] for r in recommendations]
@@ -208,16 +306,17 @@ def test_track_via_api(track_id: str,
 
         # Count artist matches (case-insensitive partial match)
         artist_lower = track_artist.lower()
+        recs_artist_lower = [r['artist'].lower() for r in recommendations]
         artist_matches = sum(
-            1 for r in recommendations
-            if artist_lower in r['artist'].lower() or r['artist'].lower() in artist_lower
+            1 for a in recs_artist_lower
+            if artist_lower in a or a in artist_lower
         )
 
-        print(f"\n  Statistics:")
-        print(f"    Average similarity: {avg_similarity:.3f}")
-        print(f"    Max similarity: {max_similarity:.3f}")
-        print(f"    Min similarity: {min_similarity:.3f}")
-        print(f"    Same artist matches: {artist_matches}/{len(recommendations)}")
+        lines.append(f"\n  Statistics:")
+        lines.append(f"    Average similarity: {avg_similarity:.3f}")
+        lines.append(f"    Max similarity: {max_similarity:.3f}")
+        lines.append(f"    Min similarity: {min_similarity:.3f}")
+        lines.append(f"    Same artist matches: {artist_matches}/{len(recommendations)}")
 
         # Quality assessment
         if max_similarity >= 0.8:
@@ -227,7 +326,7 @@ def test_track_via_api(track_id: str,
         else:
             quality = f"{Colors.RED}❌ POOR{Colors.END}"
 
-        print(f"    Quality: {quality}")
+        lines.append(f"    Quality: {quality}")
 
         return {
             'track_id': track_id,
@@ -242,17 +341,36 @@ def test_track_via_api(track_id: str,
             'recommendations': recommendations
         }
 
-    except requests.exceptions.Timeout:
-        print(f"{Colors.RED}❌ Request timeout (>120s){Colors.END}")
-        print(f"   The embedding generation might be too slow")
-        return None
-    except requests.exceptions.ConnectionError:
-        print(f"{Colors.RED}❌ Connection error - backend might have crashed{Colors.END}")
-        return None
     except Exception as e:
-        print(f"{Colors.RED}❌ Error: {e}{Colors.END}")
+        lines.append(f"{Colors.RED}❌ Error: {e}{Colors.END}")
         return None
 
+    finally:
+        print('\n'.join(lines))
+
+
+async def run_tests(tracks: List[Dict]) -> List[Dict]:
+    """
+    Test all tracks via API concurrently.
+
+    Returns:
+        Results of the successful tests, in input order
+    """
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(*[
+            test_track_via_api(
+                session,
+                track_id=track['id'],
+                track_title=track['title'],
+                track_artist=track['artist'],
+                test_num=i,
+                total_tests=len(tracks)
+            )
+            for i, track in enumerate(tracks, 1)
+        ])
+
+    return [result for result in results if result]
+
 
 def print_summary(results: List[Dict]):
     """Print overall test summary with pass/fail verdict."""
@@ -279,8 +397,7 @@ def print_summary(results: List[Dict]):
     overall_avg_time = sum(avg_times) / len(avg_times)
 
     # Calculate median
-    sorted_max_sims = sorted(max_sims)
-    median_max_sim = sorted_max_sims[len(sorted_max_sims) // 2]
+    median_max_sim = median(max_sims)
 
     print(f"\nTested: {total_tests} unknown tracks")
     print(f"Success rate: {total_tests}/{total_tests} (100%)")
@@ -325,59 +442,82 @@ def print_summary(results: List[Dict]):
         print(f"   - Verify embedding service configuration is consistent")
 
 
-def main():
-    """Main entry point."""
-    print_header("Testing Unknown Track Recommendations via API")
+async def check_and_find_unknown(artists: List[str],
+                                 tracks_per_artist: int) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    Check backend health while the Deezer searches are already running.
+
+    The health check only hits localhost, so the remote searches are started
+    alongside it instead of after it.
+
+    Args:
+        artists: List of artists to search for
+        tracks_per_artist: Number of tracks to fetch per artist
 
-    # Step 1: Check backend health
-    health_data = check_backend_health()
+    Returns:
+        Tuple of (health data or None, unknown tracks)
+    """
+    health_task = asyncio.create_task(asyncio.to_thread(check_backend_health, SESSION))
+    unknown_task = asyncio.create_task(find_unknown_tracks(artists, tracks_per_artist))
+
+    health_data = await health_task
     if not health_data:
-        print(f"\n{Colors.RED}Cannot proceed without healthy backend. Exiting.{Colors.END}")
-        sys.exit(1)
+        unknown_task.cancel()
+        # The search may already have failed on its own; the backend error takes precedence
+        await asyncio.gather(unknown_task, return_exceptions=True)
+        return None, []
 
-    # Step 2: Find tracks not in database
-    unknown_tracks = find_unknown_tracks(
-        artists=["Eminem", "Drake", "The Weeknd", "Ed Sheeran"],
-        tracks_per_artist=30
-    )
+    return health_data, await unknown_task
 
-    if not unknown_tracks:
-        print(f"\n{Colors.YELLOW}No unknown tracks found to test.{Colors.END}")
-        print(f"This could mean:")
-        print(f"  - Your database has excellent coverage")
-        print(f"  - Try searching for less popular artists")
-        print(f"  - Try more recent releases")
-        sys.exit(0)
-
-    # Step 3: Test multiple tracks
-    test_count = min(3, len(unknown_tracks))
-    print(f"\n{Colors.BLUE}Testing {test_count} unknown tracks...{Colors.END}")
-
-    results = []
-    for i, track in enumerate(unknown_tracks[:test_count], 1):
-        result = test_track_via_api(
-            track_id=track['id'],
-            track_title=track['title'],
-            track_artist=track['artist'],
-            test_num=i,
-            total_tests=test_count
-        )
 
-        if result:
-            results.append(result)
+def main():
+    """Main entry point."""
+    print_header("Testing Unknown Track Recommendations via API")
 
-        # Small delay between tests
-        if i < test_count:
-            time.sleep(1)
+    # Warm up the vector database in the background while the backend is checked
+    warmup = threading.Thread(
+        target=_warmup,
+        args=(get_vector_db_service(),),
+        daemon=True
+    )
+    warmup.start()
+    warmup.join(timeout=0.2)
 
-    # Step 4: Print summary
-    print_summary(results)
+    try:
+        # Steps 1 & 2: Check backend health and find tracks not in database
+        health_data, unknown_tracks = asyncio.run(check_and_find_unknown(
+            artists=["Eminem", "Drake", "The Weeknd", "Ed Sheeran"],
+            tracks_per_artist=30
+        ))
+        if not health_data:
+            print(f"\n{Colors.RED}Cannot proceed without healthy backend. Exiting.{Colors.END}")
+            sys.exit(1)
+
+        if not unknown_tracks:
+            print(f"\n{Colors.YELLOW}No unknown tracks found to test.{Colors.END}")
+            print(f"This could mean:")
+            print(f"  - Your database has excellent coverage")
+            print(f"  - Try searching for less popular artists")
+            print(f"  - Try more recent releases")
+            sys.exit(0)
+
+        # Step 3: Test multiple tracks
+        test_count = min(3, len(unknown_tracks))
+        print(f"\n{Colors.BLUE}Testing {test_count} unknown tracks...{Colors.END}")
+
+        results = asyncio.run(run_tests(unknown_tracks[:test_count]))
+
+        # Step 4: Print summary
+        print_summary(results)
+
+        # Exit with appropriate code
+        if results and all(r['max_similarity'] >= 0.6 for r in results):
+            sys.exit(0)  # Success
+        else:
+            sys.exit(1)  # Failure
 
-    # Exit with appropriate code
-    if results and all(r['max_similarity'] >= 0.6 for r in results):
-        sys.exit(0)  # Success
-    else:
-        sys.exit(1)  # Failure
+    finally:
+        SESSION.close()
 
 
 if __name__ == "__main__":
@@ -23,6 +23,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.services.vector_db_service import get_vector_db_service
 import numpy as np
 
+# Number of tracks fetched in one call for the data checks
+SAMPLE_SIZE = 64
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -79,37 +82,42 @@ def verify_database():
     try:
         logger.info("\n[3/6] Checking sample track data...")
 
-        # Get a sample track
-        results = vector_db.collection.get(limit=1, include=["embeddings", "metadatas"])
+        # Get a batch of sample tracks in a single call
+        results = vector_db.collection.get(limit=SAMPLE_SIZE, include=["embeddings", "metadatas"])
 
         if not results['ids']:
             logger.error("✗ No tracks found in collection")
             checks_failed += 1
+            sample_embeddings = None
+            sample_metadatas = []
         else:
+            sample_embeddings = np.asarray(results['embeddings'], dtype=np.float32)
+            sample_metadatas = results['metadatas']
+
             sample_id = results['ids'][0]
-            sample_embedding = results['embeddings'][0]
-            sample_metadata = results['metadatas'][0]
+            sample_metadata = sample_metadatas[0]
 
             logger.info(f"   Sample track ID: {sample_id}")
             logger.info(f"   Title: {sample_metadata.get('title', 'N/A')}")
             logger.info(f"   Artist: {sample_metadata.get('artist', 'N/A')}")
-            logger.info(f"✓ Sample track retrieved successfully")
+            logger.info(f"✓ {len(results['ids'])} sample tracks retrieved successfully")
             checks_passed += 1
 
     except Exception as e:
         logger.error(f"✗ Failed to retrieve sample track: {e}")
         checks_failed += 1
-        sample_embedding = None
+        sample_embeddings = None
+        sample_metadatas = []
 
     # Check 4: Embedding dimensions
     try:
         logger.info("\n[4/6] Checking embedding dimensions...")
 
-        if sample_embedding is None:
+        if sample_embeddings is None:
             logger.error("✗ No sample embedding available")
             checks_failed += 1
         else:
-            embedding_dim = len(sample_embedding)
+            embedding_dim = sample_embeddings.shape[1]
             expected_dim = 512  # CLAP embedding dimension
 
             if embedding_dim == expected_dim:
@@ -122,14 +130,20 @@ def verify_database():
                 )
                 checks_failed += 1
 
-            # Check normalization
-            embedding_norm = np.linalg.norm(sample_embedding)
-            if 0.95 <= embedding_norm <= 1.05:
-                logger.info(f"✓ Embedding is normalized (norm: {embedding_norm:.3f})")
+            # Check normalization of every sampled embedding at once
+            norms = np.einsum('ij,ij->i', sample_embeddings, sample_embeddings)
+            np.sqrt(norms, out=norms)
+            if np.all((norms >= 0.95) & (norms <= 1.05)):
+                logger.info(
+                    f"✓ Embeddings are normalized "
+                    f"(norms: {norms.min():.3f}-{norms.max():.3f})"
+                )
                 checks_passed += 1
             else:
+                bad_count = int(np.count_nonzero((norms < 0.95) | (norms > 1.05)))
                 logger.warning(
-                    f"⚠  Embedding may not be normalized (norm: {embedding_norm:.3f})"
+                    f"⚠  {bad_count}/{len(norms)} embeddings may not be normalized "
+                    f"(norms: {norms.min():.3f}-{norms.max():.3f})"
                 )
                 checks_failed += 1
 
@@ -141,15 +155,17 @@ def verify_database():
     try:
         logger.info("\n[5/6] Checking metadata completeness...")
 
-        required_fields = ['title', 'artist', 'rank', 'preview_url', 'cover']
-        missing_fields = []
+        required_fields = {'title', 'artist', 'rank', 'preview_url', 'cover'}
+        missing_fields = set()
 
-        for field in required_fields:
-            if field not in sample_metadata:
-                missing_fields.append(field)
+        for metadata in sample_metadatas:
+            missing_fields |= required_fields - (metadata or {}).keys()
 
-        if missing_fields:
-            logger.warning(f"⚠  Missing metadata fields: {', '.join(missing_fields)}")
+        if not sample_metadatas:
+            logger.error("✗ No sample metadata available")
+            checks_failed += 1
+        elif missing_fields:
+            logger.warning(f"⚠  Missing metadata fields: {', '.join(sorted(missing_fields))}")
             checks_failed += 1
         else:
             logger.info("✓ All required metadata fields present")
@@ -163,18 +179,18 @@ def verify_database():
     try:
         logger.info("\n[6/6] Testing similarity search...")
 
-        if sample_embedding is None:
+        if sample_embeddings is None:
             logger.error("✗ No sample embedding for testing")
             checks_failed += 1
         else:
-            # Query with sample embedding
-            query_embedding = np.array(sample_embedding)
+            # Query with the first sample embedding
+            query_embedding = sample_embeddings[0]
             results = vector_db.query_similar(query_embedding, n_results=5)
 
-            if results['ids'] and len(results['ids']) > 0:
-                logger.info(f"✓ Similarity search working (found {len(results['ids'])} results)")
-                logger.info(f"   Top match: {results['metadatas'][0].get('title')} "
-                          f"(distance: {results['distances'][0]:.4f})")
+            if results.ids and len(results.ids) > 0:
+                logger.info(f"✓ Similarity search working (found {len(results.ids)} results)")
+                logger.info(f"   Top match: {results.metadatas[0].get('title')} "
+                          f"(distance: {results.distances[0]:.4f})")
                 checks_passed += 1
             else:
                 logger.error("✗ Similarity search returned no results")